@@ -0,0 +1,36 @@
+import argparse
+
+from histogram_packing.batch import load_pack_batch, read_index, histogram_array_rows
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Decode many packed histogram files into one memory-mapped (N, 8, 1024) .npy array."
+    )
+    parser.add_argument(
+        "patterns",
+        nargs="+",
+        help="Packed files or glob patterns (quote globs, e.g. 'captures/**/*.pack')"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="histograms.npy",
+        help="Output .npy file, appended to on re-runs (default: histograms.npy)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Number of reader threads")
+    parser.add_argument(
+        "--pyramid",
+        action="store_true",
+        help="Also keep 512 to 16 bin rebinned arrays (e.g. histograms.pyr64.npy) up to date"
+    )
+    args = parser.parse_args()
+
+    num_indexed = len(read_index(args.output + ".files.txt"))
+    if histogram_array_rows(args.output) < num_indexed:
+        num_indexed = 0  # load_pack_batch() decodes everything again
+    histograms, files = load_pack_batch(args.patterns, args.output, max_workers=args.workers,
+                                        pyramid=args.pyramid)
+    print(f"Added {len(files) - num_indexed} packed files, {histograms.shape[0]} total in {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from histogram_packing.constants import PACKED_SIZE
+
+def time_command(command, repeats, cwd=None):
+    """
+    Runs a command repeatedly in a fresh interpreter and returns the median wall time in milliseconds.
+
+    Parameters:
+        command (list): Command line to run.
+        repeats (int): Number of runs.
+        cwd (str): Working directory for the command.
+
+    Returns:
+        float: Median wall time in ms, or None if the command failed.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000.0)
+        if result.returncode != 0:
+            return None
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure interpreter startup and import time of the histogram tools."
+    )
+    parser.add_argument("--repeats", type=int, default=10, help="Runs per command (default: 10)")
+    args = parser.parse_args()
+
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    python = sys.executable
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # An all-zero frame is a valid packed file for the extract path.
+        packed_file = os.path.join(tmp_dir, "histograms.pack")
+        with open(packed_file, "wb") as f:
+            f.write(bytes(PACKED_SIZE))
+
+        commands = [
+            ("python (no imports)", [python, "-c", "pass"]),
+            ("import histogram_packing", [python, "-c", "import histogram_packing"]),
+            ("extract_histogram", [python, "-c",
+                                   f"from histogram_packing import extract_histogram; extract_histogram({packed_file!r}, 1)"]),
+            ("view_histogram_from_packed.py --no-plot", [python, os.path.join(repo_dir, "view_histogram_from_packed.py"),
+                                                         "1", "--file", packed_file, "--no-plot"]),
+            ("import histogram_packing.packing", [python, "-c", "import histogram_packing.packing"]),
+            ("import numpy (reference)", [python, "-c", "import numpy"]),
+            ("import matplotlib.pyplot (reference)", [python, "-c", "import matplotlib.pyplot"]),
+        ]
+
+        print(f"Median of {args.repeats} runs:")
+        for name, command in commands:
+            elapsed = time_command(command, args.repeats, cwd=repo_dir)
+            if elapsed is None:
+                print(f"  {name:<42} failed (missing dependency?)")
+            else:
+                print(f"  {name:<42} {elapsed:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
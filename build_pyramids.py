@@ -0,0 +1,34 @@
+import os
+import argparse
+
+from histogram_packing.batch import expand_pack_files
+from histogram_packing.pyramid import build_pack_pyramid, pyramid_filename
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write .pack.pyr rebinned preview levels (512 to 16 bins) next to packed histogram files."
+    )
+    parser.add_argument(
+        "patterns",
+        nargs="+",
+        help="Packed files or glob patterns (quote globs, e.g. 'captures/**/*.pack')"
+    )
+    parser.add_argument("--force", action="store_true", help="Rebuild pyramids that are already up to date")
+    args = parser.parse_args()
+
+    num_built = 0
+    for packed_file in expand_pack_files(args.patterns):
+        pyramid_file = pyramid_filename(packed_file)
+        if (not args.force and os.path.exists(pyramid_file)
+                and os.path.getmtime(pyramid_file) >= os.path.getmtime(packed_file)):
+            continue
+        try:
+            build_pack_pyramid(packed_file)
+            num_built += 1
+        except Exception as e:
+            print(f"Error processing {packed_file}: {e}")
+
+    print(f"Built {num_built} pyramid files")
+
+if __name__ == "__main__":
+    main()
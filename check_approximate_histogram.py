@@ -0,0 +1,98 @@
+import sys
+import time
+import argparse
+import numpy as np
+
+from histogram_packing.approx import approximate_histogram, histogram_percentiles, percentile_bounds
+from histogram_packing.core import compute_histogram
+from histogram_packing.patterns import generate_test_pattern
+
+PERCENTILES = [1, 5, 25, 50, 75, 95, 99]
+
+def best_time(func, repeats=5):
+    """
+    Returns the result of func() and its fastest wall time in seconds over repeats runs.
+    """
+    elapsed = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        elapsed.append(time.perf_counter() - start)
+    return result, min(elapsed)
+
+def check_pattern(image, exact, step, method, seed, confidence):
+    """
+    Checks that the approximate histogram's bounds contain the exact histogram.
+
+    Parameters:
+        image (np.ndarray): 2D image array.
+        exact (np.ndarray): Exact 1024-bin histogram of the image.
+        step (int): Sampling step.
+        method (str): "stride" or "random".
+        seed (int): Seed for the pixel subset.
+        confidence (float): Confidence level of the bounds.
+
+    Returns:
+        ok (bool): True if every bin and every checked percentile is within its bounds.
+        elapsed (float): Time of the approximate histogram in seconds.
+        message (str): Summary of the check.
+    """
+    approx, elapsed = best_time(lambda: approximate_histogram(image, step, method, seed, confidence))
+
+    bins_ok = (approx["lower"] <= exact) & (exact <= approx["upper"])
+
+    true_bins = histogram_percentiles(exact, PERCENTILES)
+    _, low, high = percentile_bounds(approx["sample_counts"], PERCENTILES, confidence)
+    percentiles_ok = (low <= true_bins) & (true_bins <= high)
+
+    ok = bool(bins_ok.all() and percentiles_ok.all())
+    message = (f"bins outside bounds: {np.count_nonzero(~bins_ok)}, "
+               f"percentiles outside bounds: {np.count_nonzero(~percentiles_ok)}, "
+               f"max bin error {np.max(np.abs(approx['counts'] - exact))} <= bound {approx['bin_error']:.0f}")
+    return ok, elapsed, message
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check the error bounds and speedup of the approximate histogram on all eight test patterns."
+    )
+    parser.add_argument("--width", type=int, default=3840, help="Pattern width (default: 3840)")
+    parser.add_argument("--height", type=int, default=2160, help="Pattern height (default: 2160)")
+    parser.add_argument("--steps", type=int, nargs="+", default=[16, 64, 256],
+                        help="Sampling steps (default: 16 64 256)")
+    parser.add_argument("--confidence", type=float, default=0.99, help="Confidence level (default: 0.99)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the pixel subsets (default: 0)")
+    parser.add_argument("--min-speedup", type=float, default=10.0,
+                        help="Required speedup over the exact histogram (default: 10)")
+    parser.add_argument("--speedup-step", type=int, default=256,
+                        help="Smallest step the speedup is required at, smaller steps are only reported (default: 256)")
+    args = parser.parse_args()
+
+    # Pattern 7 is random noise, seed it so that every run checks the same frames.
+    np.random.seed(args.seed)
+
+    all_ok = True
+    for pattern_index in range(1, 9):
+        image = generate_test_pattern(pattern_index, height=args.height, width=args.width)
+
+        exact, exact_elapsed = best_time(lambda: compute_histogram(image))
+
+        for step in args.steps:
+            for method in ("stride", "random"):
+                ok, elapsed, message = check_pattern(image, exact, step, method, args.seed, args.confidence)
+                speedup = exact_elapsed / elapsed
+                if step >= args.speedup_step and speedup < args.min_speedup:
+                    ok = False
+                    message += f", speedup below {args.min_speedup:.0f}x"
+                status = "✅" if ok else "❌"
+                print(f"{status} Pattern {pattern_index}, step {step}, {method}: {message}, "
+                      f"{elapsed * 1000:.1f} ms ({speedup:.0f}x faster than exact)")
+                all_ok = all_ok and ok
+
+    if all_ok:
+        print("\n🎉 All error bounds and speedups hold!")
+    else:
+        print("\n❗ Some error bounds or speedups were not met!")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
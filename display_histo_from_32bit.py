@@ -1,29 +1,6 @@
 import os
-import numpy as np
-import matplotlib.pyplot as plt
 
-def load_histogram(bin_filename, num_bins=1024):
-    """
-    Reads a histogram from a .bin file.
-
-    Parameters:
-        bin_filename (str): Path to the histogram .bin file.
-        num_bins (int): Number of bins in the histogram (1024 for 10-bit images).
-
-    Returns:
-        np.ndarray: Histogram values as an array.
-    """
-    try:
-        with open(bin_filename, "rb") as f:
-            histogram = np.frombuffer(f.read(), dtype=np.uint32)
-
-        if histogram.size != num_bins:
-            raise ValueError(f"Unexpected histogram size in {bin_filename}. Expected {num_bins}, got {histogram.size}")
-
-        return histogram
-    except Exception as e:
-        print(f"Error reading {bin_filename}: {e}")
-        return None
+from histogram_packing.core import load_histogram
 
 def display_histogram(bin_filename):
     """
@@ -32,6 +9,8 @@ def display_histogram(bin_filename):
     Parameters:
         bin_filename (str): Path to the histogram .bin file.
     """
+    import matplotlib.pyplot as plt
+
     histogram = load_histogram(bin_filename)
     if histogram is None:
         return
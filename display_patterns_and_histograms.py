@@ -1,48 +1,11 @@
 import os
 import numpy as np
-import matplotlib.pyplot as plt
 
-def read_raw_image(filepath, width=1920, height=1080):
-    """
-    Reads a raw image file that contains a 1920x1080 image stored as 16-bit unsigned integers.
-    
-    Parameters:
-        filepath (str): Path to the raw file.
-        width (int): Image width (default 1920).
-        height (int): Image height (default 1080).
-    
-    Returns:
-        image (np.ndarray): 2D array (height x width) of type uint16.
-    """
-    num_pixels = width * height
-    expected_bytes = num_pixels * 2  # 2 bytes per pixel (16-bit)
-    
-    with open(filepath, "rb") as f:
-        data = f.read()
-    
-    if len(data) != expected_bytes:
-        raise ValueError(f"File {filepath} does not contain the expected number of bytes: expected {expected_bytes}, got {len(data)}")
-    
-    # Convert to numpy array of type uint16 and reshape to (height, width)
-    image = np.frombuffer(data, dtype=np.uint16).reshape((height, width))
-    return image
-
-def compute_histogram(image):
-    """
-    Compute the histogram of a 10-bit image (values 0 to 1023).
-    
-    Parameters:
-        image (np.ndarray): 2D image array.
-        
-    Returns:
-        hist (np.ndarray): 1D histogram array with 1024 bins.
-        bins (np.ndarray): Bin edges.
-    """
-    # Use bins from 0 to 1024 (which creates 1024 bins for values 0..1023)
-    hist, bins = np.histogram(image, bins=np.arange(1025))
-    return hist, bins
+from histogram_packing.core import read_raw_image, compute_histogram
 
 def main():
+    import matplotlib.pyplot as plt
+
     # Directory containing the raw files
     folder = "image_patterns"
     # Get all files ending with .raw (case-insensitive)
@@ -61,7 +24,8 @@ def main():
     for file in raw_files:
         try:
             img = read_raw_image(file)
-            h, b = compute_histogram(img)
+            h = compute_histogram(img)
+            b = np.arange(len(h) + 1)
             images.append(img)
             hists.append(h)
             bins_list.append(b)
@@ -1,57 +1,24 @@
 import os
-import numpy as np
+import argparse
 
-def read_raw_image(filepath, width=1920, height=1080):
-    """
-    Reads a raw image file that contains a 1920x1080 image stored as 16-bit unsigned integers.
-    
-    Parameters:
-        filepath (str): Path to the raw file.
-        width (int): Image width (default 1920).
-        height (int): Image height (default 1080).
-    
-    Returns:
-        np.ndarray: 2D array (height x width) of type uint16.
-    """
-    num_pixels = width * height
-    expected_bytes = num_pixels * 2  # 2 bytes per pixel (16-bit)
-    
-    with open(filepath, "rb") as f:
-        data = f.read()
-    
-    if len(data) != expected_bytes:
-        raise ValueError(f"File {filepath} does not contain the expected number of bytes: expected {expected_bytes}, got {len(data)}")
-    
-    image = np.frombuffer(data, dtype=np.uint16).reshape((height, width))
-    return image
-
-def compute_histogram(image):
-    """
-    Compute the histogram of a 10-bit image (values 0 to 1023).
-    
-    Parameters:
-        image (np.ndarray): 2D image array.
-        
-    Returns:
-        hist (np.ndarray): 1D histogram array with 1024 bins.
-    """
-    # Create bins from 0 to 1024 to get 1024 bins for pixel values 0...1023.
-    hist, _ = np.histogram(image, bins=np.arange(1025))
-    return hist
-
-def save_histogram_to_text(hist, output_filename):
-    """
-    Save the histogram as a comma-delimited text file with two columns: bin, count.
-    
-    Parameters:
-        hist (np.ndarray): 1D histogram array.
-        output_filename (str): Path to the output text file.
-    """
-    with open(output_filename, "w") as f:
-        for bin_val, count in enumerate(hist):
-            f.write(f"{bin_val},{count}\n")
+from histogram_packing.approx import format_bounds
+from histogram_packing.core import read_raw_image, compute_histogram, save_histogram_to_text
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Export bin,count text histograms for the .raw files in image_patterns."
+    )
+    parser.add_argument(
+        "--sample-step",
+        type=int,
+        default=None,
+        help="Approximate mode: histogram about 1 in N pixels, scaled to the full frame"
+    )
+    parser.add_argument("--sample-method", choices=["stride", "random"], default="stride",
+                        help="Pixel subset for the approximate mode (default: stride)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the pixel subset (default: 0)")
+    args = parser.parse_args()
+
     # Folder containing the raw files
     folder = "image_patterns"
     # List all .raw files (case-insensitive)
@@ -69,7 +36,11 @@ def main():
             print(f"Error reading {raw_file}: {e}")
             continue
         
-        hist = compute_histogram(image)
+        hist, approx = compute_histogram(image, args.sample_step, args.sample_method, args.seed,
+                                         return_bounds=True)
+        if approx is not None:
+            # The counts are estimates, report how far they can be off.
+            print(format_bounds(approx))
         # Construct output filename: same base name, with extension .txt (or .csv)
         base_name = os.path.splitext(os.path.basename(raw_file))[0]
         output_filename = os.path.join(folder, f"{base_name}_hist.txt")
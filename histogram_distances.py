@@ -0,0 +1,46 @@
+import argparse
+import numpy as np
+
+from histogram_packing.distances import METRICS, detect_anomalies
+from histogram_packing.packing import decode_packed_frame
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute cross-camera and temporal histogram distances and flag anomalous cameras."
+    )
+    parser.add_argument(
+        "file",
+        type=str,
+        help="(N, 8, 1024) .npy array (see batch_load_packs.py) or a single packed file"
+    )
+    parser.add_argument("--metric", choices=list(METRICS), default="chi2", help="Distance metric (default: chi2)")
+    parser.add_argument("--camera-threshold", type=float, default=None, help="Cross-camera distance threshold")
+    parser.add_argument("--temporal-threshold", type=float, default=None, help="Frame-to-history distance threshold")
+    parser.add_argument("--window", type=int, default=30, help="History length in frames (default: 30)")
+    args = parser.parse_args()
+
+    if args.file.endswith(".npy"):
+        histograms = np.load(args.file, mmap_mode="r")
+    else:
+        with open(args.file, "rb") as f:
+            histograms = decode_packed_frame(f.read())
+
+    result = detect_anomalies(histograms, args.metric, args.camera_threshold,
+                              args.temporal_threshold, window=args.window)
+
+    if "camera_flags" not in result and "temporal_flags" not in result:
+        np.set_printoptions(precision=4, suppress=True)
+        print(f"Pairwise {args.metric} distances of the last frame:")
+        print(result["pairwise"][-1])
+        return
+
+    for name in ("camera_flags", "temporal_flags"):
+        if name not in result:
+            continue
+        frames, cameras = np.nonzero(result[name])
+        print(f"{name}: {len(frames)} flagged camera frames")
+        for frame_idx, camera in zip(frames, cameras):
+            print(f"  frame {frame_idx}, camera {camera + 1}")
+
+if __name__ == "__main__":
+    main()
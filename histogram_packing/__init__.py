@@ -0,0 +1,64 @@
+"""
+Histogram packing for eight 1024-bin camera histograms (21-bit counts, 21504-byte frames).
+
+Submodules only import NumPy when they need it and never import matplotlib or
+OpenCV, and the names below are loaded on first access, so importing the
+package, or using extract_histogram() alone, stays fast enough to run once
+per frame from a shell.
+"""
+import importlib
+
+_EXPORTS = {
+    "NUM_CAMERAS": "constants",
+    "NUM_BINS": "constants",
+    "COUNT_BITS": "constants",
+    "BIN_SIZE_BYTES": "constants",
+    "PACKED_SIZE": "constants",
+    "PYRAMID_LEVELS": "constants",
+    "extract_histogram": "extract",
+    "extract_preview": "extract",
+    "read_pyramid_level": "extract",
+    "read_raw_image": "core",
+    "compute_histogram": "core",
+    "compute_and_save_histogram": "core",
+    "read_fpga_histogram": "core",
+    "load_histogram": "core",
+    "save_raw16": "core",
+    "save_histogram_to_text": "core",
+    "generate_test_pattern": "patterns",
+    "approximate_histogram": "approx",
+    "histogram_percentiles": "approx",
+    "percentile_bounds": "approx",
+    "format_bounds": "approx",
+    "pack_histogram_bytes": "packing",
+    "pack_histograms": "packing",
+    "unpack_histogram_array": "packing",
+    "unpack_histograms": "packing",
+    "pack_sparse_histogram_bytes": "packing",
+    "pack_histogram_frame": "packing",
+    "unpack_sparse_histogram_bytes": "packing",
+    "decode_packed_frame": "packing",
+    "run_pipeline": "pipeline",
+    "load_pack_batch": "batch",
+    "build_pyramid_arrays": "batch",
+    "rebin_histograms": "pyramid",
+    "build_pyramid": "pyramid",
+    "write_pyramid": "pyramid",
+    "build_pack_pyramid": "pyramid",
+    "read_pyramid_levels": "pyramid",
+    "pairwise_camera_distances": "distances",
+    "reference_distances": "distances",
+    "temporal_distances": "distances",
+    "detect_anomalies": "distances",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+    return getattr(module, name)
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,204 @@
+import math
+from functools import lru_cache
+import numpy as np
+
+from .constants import NUM_BINS
+
+@lru_cache(maxsize=8)
+def sample_offsets(num_pixels, step, method="stride", seed=0):
+    """
+    Returns the (cached, read-only) sorted flat pixel offsets picked by sample_pixels().
+
+    Drawing the offsets costs more than gathering the pixels, so the table is
+    built once per frame size, step, method and seed and reused for every
+    frame of a stream (a fixed seed already picks the same pixels each time).
+
+    Parameters:
+        num_pixels (int): Number of pixels in the frame.
+        step (int): Sampling step (> 1).
+        method (str): "stride" or "random".
+        seed (int): Seed for the random offsets.
+
+    Returns:
+        np.ndarray: 1D intp array of num_pixels // step offsets.
+    """
+    num_samples = num_pixels // step
+    if num_samples == 0:
+        raise ValueError(f"Sampling step {step} is larger than the image ({num_pixels} pixels)")
+
+    rng = np.random.default_rng(seed)
+    if method == "stride":
+        offsets = rng.integers(0, step, size=num_samples, dtype=np.intp)
+        offsets += np.arange(0, num_samples * step, step, dtype=np.intp)
+    elif method == "random":
+        offsets = np.sort(rng.integers(0, num_pixels, size=num_samples, dtype=np.intp))
+    else:
+        raise ValueError(f"Unknown sampling method: {method}")
+    offsets.flags.writeable = False
+    return offsets
+
+def sample_pixels(image, step, method="stride", seed=0):
+    """
+    Picks about one of every `step` pixels of an image.
+
+    Methods:
+      - "stride": jittered stride, one pixel at a random offset inside every
+        run of `step` consecutive pixels (raster order). This is a stratified
+        sample: it covers the whole frame evenly and is never worse than
+        uniform random sampling, while periodic image content cannot alias
+        with the stride.
+      - "random": `num_pixels // step` pixels drawn uniformly at random (with replacement).
+
+    Parameters:
+        image (np.ndarray): 2D image array.
+        step (int): Sampling step (1 keeps every pixel).
+        method (str): "stride" or "random".
+        seed (int): Seed for the random offsets, so previews are reproducible.
+
+    Returns:
+        np.ndarray: 1D array of sampled pixel values.
+    """
+    flat = np.asarray(image).reshape(-1)
+    if step <= 1:
+        return flat
+    return flat.take(sample_offsets(flat.size, int(step), method, int(seed)))
+
+def count_bounds(counts, log_odds):
+    """
+    Bounds the expected value of sample counts from the observed counts.
+
+    Each count is a sum of independent 0/1 draws. The Chernoff bound
+    P(X <= mu - t) <= exp(-t^2 / (2 mu)) gives the high bound and the Bernstein
+    bound P(X >= mu + t) <= exp(-t^2 / (2 (mu + t / 3))) the low bound, so
+    each side is wrong with probability at most exp(-log_odds).
+
+    Parameters:
+        counts (np.ndarray): Observed sample counts.
+        log_odds (float): Negative log of the allowed failure probability per side.
+
+    Returns:
+        low (np.ndarray): Lowest plausible expected count.
+        high (np.ndarray): Highest plausible expected count.
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    high = ((math.sqrt(2 * log_odds) + np.sqrt(2 * log_odds + 4 * counts)) / 2) ** 2
+    excess = (np.sqrt(16 * log_odds ** 2 / 9 + 8 * log_odds * counts) - 4 * log_odds / 3) / 2
+    low = np.maximum(counts - excess, 0.0)
+    return low, high
+
+def approximate_histogram(image, step=256, method="stride", seed=0, confidence=0.99):
+    """
+    Estimates the 1024-bin histogram of a 10-bit image from a pixel subset.
+
+    The sampled counts are scaled to full-frame totals. The per-bin bounds
+    (see count_bounds()) hold for all 1024 bins at once with the given
+    confidence and, unlike a normal approximation, stay valid for bins with
+    only a few samples.
+
+    Parameters:
+        image (np.ndarray): 2D image array.
+        step (int): Sampling step, about num_pixels / step pixels are histogrammed.
+        method (str): "stride" or "random" (see sample_pixels()).
+        seed (int): Seed for the sample.
+        confidence (float): Confidence level of the bounds.
+
+    Returns:
+        dict: "counts" (1024,) int64 full-frame estimate, "lower"/"upper" (1024,)
+            float64 count bounds, "bin_error" largest distance from the estimate
+            to a bound, "sample_counts" the raw counts of the sample, and
+            "num_samples", "num_pixels", "confidence".
+    """
+    image = np.asarray(image)
+    num_pixels = image.size
+    samples = sample_pixels(image, step, method, seed)
+    num_samples = samples.size
+
+    # Pixel values above 10 bits are ignored, like np.histogram over 0..1023.
+    sample_counts = np.bincount(samples.reshape(-1), minlength=NUM_BINS)[:NUM_BINS]
+    scale = num_pixels / num_samples
+    counts = np.rint(sample_counts * scale).astype(np.int64)
+
+    # A bin's share is bounded from its own count and from the count of all
+    # other samples (tighter for dominant bins): four tails per bin.
+    log_odds = math.log(4 * NUM_BINS / (1.0 - confidence))
+    expected_low, expected_high = count_bounds(sample_counts, log_odds)
+    other_low, other_high = count_bounds(num_samples - sample_counts, log_odds)
+    expected_low = np.maximum(expected_low, num_samples - other_high)
+    expected_high = np.minimum(expected_high, num_samples - other_low)
+    lower = np.clip(expected_low / num_samples, 0.0, 1.0) * num_pixels
+    upper = np.clip(expected_high / num_samples, 0.0, 1.0) * num_pixels
+    if num_samples == num_pixels:
+        lower = upper = counts.astype(np.float64)
+
+    return {
+        "counts": counts,
+        "lower": lower,
+        "upper": upper,
+        "bin_error": float(np.max(np.maximum(upper - counts, counts - lower))),
+        "sample_counts": sample_counts,
+        "num_samples": num_samples,
+        "num_pixels": num_pixels,
+        "confidence": confidence,
+    }
+
+def histogram_percentiles(histogram, percentiles):
+    """
+    Returns the bin of each percentile: the first bin where the cumulative count reaches it.
+
+    Parameters:
+        histogram (np.ndarray): 1D histogram counts.
+        percentiles (array-like): Percentiles between 0 and 100.
+
+    Returns:
+        np.ndarray: Bin index of each percentile.
+    """
+    cumulative = np.cumsum(histogram)
+    targets = np.asarray(percentiles, dtype=np.float64) / 100.0 * cumulative[-1]
+    return np.minimum(np.searchsorted(cumulative, targets, side="left"), len(cumulative) - 1)
+
+def percentile_bounds(sample_counts, percentiles, confidence=0.99):
+    """
+    Estimates percentiles from a sampled histogram with distribution-free bounds.
+
+    By the Dvoretzky-Kiefer-Wolfowitz inequality the sampled CDF is within
+    eps = sqrt(ln(2 / (1 - confidence)) / (2 * num_samples)) of the true CDF
+    everywhere, so the true p-th percentile lies between the sampled
+    percentiles at p - eps and p + eps.
+
+    Parameters:
+        sample_counts (np.ndarray): Histogram of the sampled pixels (unscaled).
+        percentiles (array-like): Percentiles between 0 and 100.
+        confidence (float): Confidence level of the bounds.
+
+    Returns:
+        estimate (np.ndarray): Percentile bins of the sample.
+        low (np.ndarray): Lower bound bin of each percentile.
+        high (np.ndarray): Upper bound bin of each percentile.
+    """
+    num_samples = int(np.sum(sample_counts))
+    eps = math.sqrt(math.log(2.0 / (1.0 - confidence)) / (2.0 * num_samples)) * 100.0
+    percentiles = np.asarray(percentiles, dtype=np.float64)
+
+    estimate = histogram_percentiles(sample_counts, percentiles)
+    low = histogram_percentiles(sample_counts, np.clip(percentiles - eps, 0.0, 100.0))
+    high = histogram_percentiles(sample_counts, np.clip(percentiles + eps, 0.0, 100.0))
+    # Past the top of the sampled CDF the true percentile can be in any higher bin.
+    high = np.where(percentiles + eps > 100.0, len(sample_counts) - 1, high)
+    return estimate, low, high
+
+def format_bounds(approx, percentiles=(1, 50, 99)):
+    """
+    Summarizes the error bounds of an approximate histogram on one line.
+
+    Parameters:
+        approx (dict): Result of approximate_histogram().
+        percentiles (array-like): Percentiles to report with their bounds.
+
+    Returns:
+        str: Sample size, worst-case bin error and percentile bounds.
+    """
+    estimate, low, high = percentile_bounds(approx["sample_counts"], percentiles, approx["confidence"])
+    return (f"Approximate histogram from {approx['num_samples']} of {approx['num_pixels']} pixels: "
+            f"bin error <= {approx['bin_error']:.0f}, "
+            + ", ".join(f"p{p} = {e} [{lo}, {hi}]" for p, e, lo, hi in zip(percentiles, estimate, low, high))
+            + f" ({approx['confidence']:.0%} confidence)")
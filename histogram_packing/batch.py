@@ -0,0 +1,289 @@
+import os
+import io
+import glob
+import shutil
+import hashlib
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from .constants import NUM_BINS, NUM_CAMERAS, PACKED_SIZE, PYRAMID_LEVELS
+from .packing import unpack_histogram_array, unpack_sparse_histogram_bytes
+from .pyramid import rebin_histograms
+
+def expand_pack_files(patterns):
+    """
+    Expands glob patterns and plain file names into a sorted list of absolute paths.
+
+    Parameters:
+        patterns (str or list): A glob pattern / file name, or a list of them.
+
+    Returns:
+        list: Unique absolute paths of the matching files, sorted.
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+
+    files = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True)
+        if not matches and os.path.isfile(pattern):
+            matches = [pattern]
+        files.update(os.path.abspath(m) for m in matches if os.path.isfile(m))
+    return sorted(files)
+
+def read_index(index_filename):
+    """
+    Reads the sidecar index: one packed file path per line, line i is row i of the array.
+    """
+    if not os.path.exists(index_filename):
+        return []
+    with open(index_filename, "r") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+def histogram_array_rows(npy_filename):
+    """
+    Returns the number of rows of an (N, 8, num_bins) .npy file, 0 if it does not exist.
+    """
+    if not os.path.exists(npy_filename):
+        return 0
+    return np.load(npy_filename, mmap_mode="r").shape[0]
+
+def resize_histogram_array(npy_filename, num_rows, num_bins=NUM_BINS):
+    """
+    Opens an (N, 8, num_bins) uint32 .npy file as a memmap, creating or resizing it to num_rows.
+
+    Existing rows are kept. When the new shape fits in the current header the
+    file is resized in place, otherwise the existing rows are copied once into
+    a new file.
+
+    Parameters:
+        npy_filename (str): Path to the .npy file.
+        num_rows (int): Number of frames the array must hold.
+        num_bins (int): Number of bins per histogram.
+
+    Returns:
+        np.memmap: Writable (num_rows, 8, num_bins) uint32 array.
+    """
+    shape = (num_rows, NUM_CAMERAS, num_bins)
+    if not os.path.exists(npy_filename):
+        return np.lib.format.open_memmap(npy_filename, mode="w+", dtype=np.uint32, shape=shape)
+
+    with open(npy_filename, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            old_shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            old_shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        header_len = f.tell()
+
+        if old_shape[1:] != shape[1:] or dtype != np.uint32 or fortran_order:
+            raise ValueError(f"{npy_filename} is not an (N, {NUM_CAMERAS}, {num_bins}) uint32 histogram array")
+
+        header = io.BytesIO()
+        header_data = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": shape}
+        if version == (1, 0):
+            np.lib.format.write_array_header_1_0(header, header_data)
+        else:
+            np.lib.format.write_array_header_2_0(header, header_data)
+
+        if len(header.getvalue()) == header_len:
+            f.seek(0)
+            f.write(header.getvalue())
+            f.truncate(header_len + num_rows * NUM_CAMERAS * num_bins * 4)
+            resized = True
+        else:
+            resized = False
+
+    if resized:
+        return np.lib.format.open_memmap(npy_filename, mode="r+")
+
+    # The header grew past its padding: copy the existing rows into a fresh file.
+    tmp_filename = npy_filename + ".tmp"
+    old = np.load(npy_filename, mmap_mode="r")
+    new = np.lib.format.open_memmap(tmp_filename, mode="w+", dtype=np.uint32, shape=shape)
+    keep = min(old.shape[0], num_rows)
+    new[:keep] = old[:keep]
+    new.flush()
+    del old, new
+    shutil.move(tmp_filename, npy_filename)
+    return np.lib.format.open_memmap(npy_filename, mode="r+")
+
+def read_pack_into(filename, buffer):
+    """
+    Reads one packed file into a 21504-byte row of a preallocated buffer.
+
+    Dense frames are left in the buffer for the vectorized batch decode.
+    Sparse frames (always smaller) are decoded here, in the reader thread.
+
+    Returns:
+        np.ndarray: (8, 1024) counts of a sparse frame, or None for a dense frame.
+    """
+    with open(filename, "rb") as f:
+        num_read = f.readinto(buffer)
+        extra = f.read(1)
+
+    if num_read == PACKED_SIZE and not extra:
+        return None
+    if num_read < PACKED_SIZE:
+        try:
+            return unpack_sparse_histogram_bytes(buffer[:num_read].tobytes())
+        except ValueError as e:
+            raise ValueError(f"Unexpected file size in {filename}: {e}")
+    raise ValueError(f"Unexpected file size in {filename}: expected {PACKED_SIZE} bytes or a sparse frame")
+
+def load_pack_batch(patterns, npy_filename, index_filename=None, max_workers=None, chunk_size=256,
+                    pyramid=False):
+    """
+    Decodes many histograms.pack files into one memory-mapped (N, 8, 1024) array.
+
+    Files already listed in the sidecar index are skipped, so re-running on a
+    growing folder only decodes and appends the new files. If the array is
+    missing or has fewer rows than its index lists, the index is dropped and
+    every file is decoded again. Reading is done by a thread pool one chunk
+    ahead of the vectorized decode of the current chunk.
+
+    Parameters:
+        patterns (str or list): Glob pattern(s) or file names of packed files.
+        npy_filename (str): Output .npy file (created or appended to).
+        index_filename (str): Sidecar file-name index (default: npy_filename + ".files.txt").
+        max_workers (int): Number of reader threads (default: ThreadPoolExecutor default).
+        chunk_size (int): Number of files decoded per vectorized batch.
+        pyramid (bool): Also keep the rebinned level arrays up to date (see build_pyramid_arrays()).
+
+    Returns:
+        histograms (np.memmap): (N, 8, 1024) uint32 array, row i from files[i].
+        files (list): Packed file path of each row.
+    """
+    if index_filename is None:
+        index_filename = npy_filename + ".files.txt"
+
+    indexed = read_index(index_filename)
+    num_rows = histogram_array_rows(npy_filename)
+    if num_rows < len(indexed):
+        # The indexed rows are gone (array deleted or truncated), never hand them back as zeros.
+        print(f"{npy_filename} has {num_rows} rows but {index_filename} lists {len(indexed)} files, "
+              f"decoding all files again")
+        os.remove(index_filename)
+        indexed = []
+    known = set(indexed)
+    new_files = [f for f in expand_pack_files(patterns) if f not in known]
+
+    histograms = resize_histogram_array(npy_filename, len(indexed) + len(new_files))
+    if not new_files:
+        if pyramid:
+            build_pyramid_arrays(npy_filename, index_filename)
+        return histograms, indexed
+
+    chunks = [new_files[i:i + chunk_size] for i in range(0, len(new_files), chunk_size)]
+
+    def submit_reads(executor, chunk):
+        buffer = np.empty((len(chunk), PACKED_SIZE), dtype=np.uint8)
+        futures = [executor.submit(read_pack_into, name, buffer[i]) for i, name in enumerate(chunk)]
+        return buffer, futures
+
+    row = len(indexed)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = submit_reads(executor, chunks[0])
+        for chunk_idx in range(len(chunks)):
+            buffer, futures = pending
+            if chunk_idx + 1 < len(chunks):
+                pending = submit_reads(executor, chunks[chunk_idx + 1])
+            sparse_frames = [future.result() for future in futures]
+            decoded = unpack_histogram_array(buffer)
+            for i, sparse in enumerate(sparse_frames):
+                if sparse is not None:
+                    decoded[i] = sparse
+            histograms[row:row + len(buffer)] = decoded
+            row += len(buffer)
+
+    histograms.flush()
+
+    # Only record the new files once their rows are on disk.
+    with open(index_filename, "a") as f:
+        for name in new_files:
+            f.write(name + "\n")
+
+    if pyramid:
+        build_pyramid_arrays(npy_filename, index_filename)
+
+    return histograms, indexed + new_files
+
+def pyramid_level_filename(npy_filename, num_bins):
+    """
+    Returns the path of a rebinned level array, e.g. histograms.pyr64.npy for histograms.npy.
+    """
+    base, _ = os.path.splitext(npy_filename)
+    return f"{base}.pyr{num_bins}.npy"
+
+def index_digest(files):
+    """
+    Returns the SHA-256 hex digest of a list of packed file paths (rows of an array).
+    """
+    return hashlib.sha256("\n".join(files).encode("utf-8")).hexdigest()
+
+def read_level_source(source_filename):
+    """
+    Reads a level array's source sidecar: the row count and index digest it was built from.
+
+    Returns:
+        num_rows (int): Number of rows built, 0 if the sidecar is missing or unreadable.
+        digest (str): index_digest() of the files of those rows, or None.
+    """
+    try:
+        with open(source_filename, "r") as f:
+            num_rows, digest = f.read().split()
+        return int(num_rows), digest
+    except (OSError, ValueError):
+        return 0, None
+
+def build_pyramid_arrays(npy_filename, index_filename=None, chunk_size=4096):
+    """
+    Keeps one (N, 8, num_bins) memmap per pyramid level next to an (N, 8, 1024) array.
+
+    Only rows missing from a level array are rebinned, so after an append
+    just the new frames are processed. A preview can then load e.g. the
+    64-bin level without reading the full-resolution array.
+
+    Each level records the row count and index digest it was built from in a
+    .source sidecar. Existing rows are only reused while the base array's
+    index still starts with the same files; otherwise (e.g. the base array
+    was rebuilt from other files, or has no index) the level is rebuilt.
+
+    Parameters:
+        npy_filename (str): The full-resolution .npy file from load_pack_batch().
+        index_filename (str): Its sidecar file-name index (default: npy_filename + ".files.txt").
+        chunk_size (int): Frames rebinned per vectorized step.
+
+    Returns:
+        dict: num_bins -> (N, 8, num_bins) uint32 memmap.
+    """
+    if index_filename is None:
+        index_filename = npy_filename + ".files.txt"
+
+    histograms = np.load(npy_filename, mmap_mode="r")
+    num_rows = histograms.shape[0]
+    files = read_index(index_filename)[:num_rows]
+    digest = index_digest(files)
+
+    levels = {}
+    for num_bins in PYRAMID_LEVELS:
+        level_filename = pyramid_level_filename(npy_filename, num_bins)
+        source_filename = level_filename + ".source"
+        num_done = 0
+        if os.path.exists(level_filename):
+            built_rows, built_digest = read_level_source(source_filename)
+            if built_rows <= len(files) and built_digest == index_digest(files[:built_rows]):
+                num_done = min(built_rows, np.load(level_filename, mmap_mode="r").shape[0])
+
+        level = resize_histogram_array(level_filename, num_rows, num_bins)
+        for start in range(num_done, num_rows, chunk_size):
+            stop = min(start + chunk_size, num_rows)
+            level[start:stop] = rebin_histograms(histograms[start:stop], num_bins)
+        level.flush()
+
+        # Only record the source once the rebinned rows are on disk.
+        with open(source_filename, "w") as f:
+            f.write(f"{num_rows} {digest}\n")
+        levels[num_bins] = level
+
+    return levels
@@ -0,0 +1,27 @@
+# Packed format: eight 1024-bin histograms, each count stored in 21 bits, so
+# every bin is one 168-bit (21-byte) block and a packed frame is 21504 bytes.
+NUM_CAMERAS = 8
+NUM_BINS = 1024
+COUNT_BITS = 21
+BIN_SIZE_BYTES = 21
+PACKED_SIZE = NUM_BINS * BIN_SIZE_BYTES
+
+# Rebinned preview levels stored next to a packed frame (see pyramid.py),
+# coarsest first, each as 8 x num_bins little-endian uint32 counts.
+PYRAMID_LEVELS = (16, 32, 64, 128, 256, 512)
+PYRAMID_MAGIC = b"HPYR"
+PYRAMID_VERSION = 1
+PYRAMID_HEADER_FORMAT = "<4sHHH6x"
+PYRAMID_HEADER_SIZE = 16
+
+# Sparse packed frame (see packing.py): a header with the number of occupied
+# bins of each camera, then one 31-bit entry per occupied bin (10-bit bin
+# index, 21-bit count) as a little-endian bit stream, cameras in order. It is
+# only written when smaller than PACKED_SIZE, so the file size tells the two
+# formats apart.
+SPARSE_MAGIC = b"HSPK"
+SPARSE_VERSION = 1
+SPARSE_HEADER_FORMAT = "<4sH8H2x"
+SPARSE_HEADER_SIZE = 24
+SPARSE_INDEX_BITS = 10
+SPARSE_ENTRY_BITS = SPARSE_INDEX_BITS + COUNT_BITS
@@ -0,0 +1,159 @@
+import numpy as np
+
+from .approx import approximate_histogram, format_bounds
+
+def read_raw_image(filepath, width=1920, height=1080):
+    """
+    Reads a raw image file that contains a 1920x1080 image stored as 16-bit unsigned integers.
+
+    Parameters:
+        filepath (str): Path to the raw file.
+        width (int): Image width (default 1920).
+        height (int): Image height (default 1080).
+
+    Returns:
+        image (np.ndarray): 2D array (height x width) of type uint16.
+    """
+    num_pixels = width * height
+    expected_bytes = num_pixels * 2  # 2 bytes per pixel (16-bit)
+
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    if len(data) != expected_bytes:
+        raise ValueError(f"File {filepath} does not contain the expected number of bytes: expected {expected_bytes}, got {len(data)}")
+
+    # Convert to numpy array of type uint16 and reshape to (height, width)
+    image = np.frombuffer(data, dtype=np.uint16).reshape((height, width))
+    return image
+
+def compute_histogram(image, sample_step=None, sample_method="stride", seed=0, return_bounds=False):
+    """
+    Compute the histogram of a 10-bit image (values 0 to 1023).
+
+    Parameters:
+        image (np.ndarray): 2D image array.
+        sample_step (int): If set, only about 1 in sample_step pixels are
+            histogrammed and the counts are scaled to the full frame
+            (see approximate_histogram() for the error bounds).
+        sample_method (str): "stride" or "random" pixel subset.
+        seed (int): Seed for the pixel subset.
+        return_bounds (bool): Also return the approximate_histogram() result
+            with the error bounds (None for an exact histogram).
+
+    Returns:
+        hist (np.ndarray): 1D histogram array with 1024 bins.
+        approx (dict): Only with return_bounds, see above.
+    """
+    if sample_step:
+        approx = approximate_histogram(image, sample_step, sample_method, seed)
+        return (approx["counts"], approx) if return_bounds else approx["counts"]
+
+    # Create bins from 0 to 1024 to get 1024 bins for pixel values 0...1023.
+    hist, _ = np.histogram(image, bins=np.arange(1025))
+    return (hist, None) if return_bounds else hist
+
+def compute_and_save_histogram(raw_filename, bin_filename, width=1920, height=1080, num_bins=1024,
+                               sample_step=None, sample_method="stride", seed=0, confidence=0.99):
+    """
+    Reads a 16-bit raw image, computes the histogram, and saves it as a .bin file.
+
+    Parameters:
+        raw_filename (str): Path to the raw image file.
+        bin_filename (str): Path to save the histogram bin file.
+        width (int): Image width.
+        height (int): Image height.
+        num_bins (int): Number of histogram bins (1024 for 10-bit images).
+        sample_step (int): If set, save an approximate histogram from about 1 in
+            sample_step pixels and print its per-bin and percentile error bounds.
+        sample_method (str): "stride" or "random" pixel subset.
+        seed (int): Seed for the pixel subset.
+        confidence (float): Confidence level of the reported bounds.
+    """
+    try:
+        # Read the raw image
+        with open(raw_filename, "rb") as f:
+            raw_data = np.frombuffer(f.read(), dtype=np.uint16)
+
+        # Ensure the data matches expected size
+        if raw_data.size != width * height:
+            raise ValueError(f"Unexpected image size in {raw_filename}. Expected {width * height}, got {raw_data.size}")
+
+        # Reshape to expected image dimensions
+        image = raw_data.reshape((height, width))
+
+        if sample_step:
+            # Approximate histogram from a pixel subset, scaled to the full frame.
+            approx = approximate_histogram(image, sample_step, sample_method, seed, confidence)
+            histogram = approx["counts"]
+            print(format_bounds(approx))
+        else:
+            # Compute histogram (10-bit values range from 0 to 1023)
+            histogram, _ = np.histogram(image, bins=num_bins, range=(0, 1023))
+
+        # Save histogram as a binary file (32-bit integers)
+        with open(bin_filename, "wb") as f:
+            f.write(histogram.astype(np.uint32).tobytes())
+
+        print(f"Saved histogram: {bin_filename}")
+
+    except Exception as e:
+        print(f"Error processing {raw_filename}: {e}")
+
+def read_fpga_histogram(filename):
+    """
+    Reads an FPGA histogram from a binary file.
+    The file is expected to contain 1024 32-bit unsigned integers.
+    """
+    hist = np.fromfile(filename, dtype=np.uint32)
+    if hist.size != 1024:
+        raise ValueError(f"Unexpected histogram size in {filename}. Expected 1024, got {hist.size}")
+    return hist
+
+def load_histogram(bin_filename, num_bins=1024):
+    """
+    Reads a histogram from a .bin file.
+
+    Parameters:
+        bin_filename (str): Path to the histogram .bin file.
+        num_bins (int): Number of bins in the histogram (1024 for 10-bit images).
+
+    Returns:
+        np.ndarray: Histogram values as an array.
+    """
+    try:
+        with open(bin_filename, "rb") as f:
+            histogram = np.frombuffer(f.read(), dtype=np.uint32)
+
+        if histogram.size != num_bins:
+            raise ValueError(f"Unexpected histogram size in {bin_filename}. Expected {num_bins}, got {histogram.size}")
+
+        return histogram
+    except Exception as e:
+        print(f"Error reading {bin_filename}: {e}")
+        return None
+
+def save_raw16(image, filename):
+    """
+    Save a 16-bit image as a raw binary file.
+    Each pixel is stored as a 16-bit unsigned integer in native byte order.
+
+    Parameters:
+        image (np.ndarray): A uint16 image array.
+        filename (str): The destination filename.
+    """
+    # Write the raw binary data (each pixel 2 bytes)
+    with open(filename, "wb") as f:
+        f.write(image.tobytes())
+
+def save_histogram_to_text(hist, output_filename):
+    """
+    Save the histogram as a comma-delimited text file with two columns: bin, count.
+
+    Parameters:
+        hist (np.ndarray): 1D histogram array.
+        output_filename (str): Path to the output text file.
+    """
+    with open(output_filename, "w") as f:
+        for bin_val, count in enumerate(hist):
+            f.write(f"{bin_val},{count}\n")
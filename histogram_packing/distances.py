@@ -0,0 +1,219 @@
+import numpy as np
+
+def normalize_histograms(histograms, in_place=False):
+    """
+    Converts histogram counts to probabilities along the last (bin) axis.
+
+    Parameters:
+        histograms (np.ndarray): Counts of shape (..., 1024).
+        in_place (bool): Divide a float64 array in place instead of allocating a new one.
+
+    Returns:
+        np.ndarray: float64 array of the same shape; all-zero histograms stay all zero.
+    """
+    counts = np.asarray(histograms, dtype=np.float64)
+    totals = counts.sum(axis=-1, keepdims=True)
+    out = counts if in_place else np.zeros_like(counts)
+    return np.divide(counts, totals, out=out, where=totals > 0)
+
+def chi_square_distance(p, q):
+    """
+    Symmetric chi-square distance, 0.5 * sum((p - q)^2 / (p + q)), over the last axis.
+    """
+    total = p + q
+    diff = (p - q) ** 2
+    return 0.5 * np.sum(np.divide(diff, total, out=np.zeros_like(diff), where=total > 0), axis=-1)
+
+def bhattacharyya_distance(p, q):
+    """
+    Bhattacharyya distance, -ln(sum(sqrt(p * q))), over the last axis.
+    Histograms with no overlap get a large finite distance instead of infinity.
+    """
+    coefficient = np.sum(np.sqrt(p * q), axis=-1)
+    return -np.log(np.clip(coefficient, 1e-300, 1.0))
+
+def l1_distance(p, q):
+    """
+    L1 (total variation x 2) distance, sum(|p - q|), over the last axis.
+    """
+    return np.sum(np.abs(p - q), axis=-1)
+
+def emd_distance(p, q):
+    """
+    1-D earth mover's distance in bins, sum(|CDF(p) - CDF(q)|), over the last axis.
+    """
+    return np.sum(np.abs(np.cumsum(p, axis=-1) - np.cumsum(q, axis=-1)), axis=-1)
+
+METRICS = {
+    "chi2": chi_square_distance,
+    "bhattacharyya": bhattacharyya_distance,
+    "l1": l1_distance,
+    "emd": emd_distance,
+}
+
+def get_metric(metric):
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric '{metric}', expected one of {', '.join(METRICS)}")
+    return METRICS[metric]
+
+def pairwise_camera_distances(histograms, metric="chi2", chunk_size=256):
+    """
+    Computes the camera-vs-camera distance matrix of every frame.
+
+    Parameters:
+        histograms (np.ndarray): Counts of shape (N, 8, 1024) or (8, 1024).
+        metric (str): One of "chi2", "bhattacharyya", "l1", "emd".
+        chunk_size (int): Frames processed per vectorized step (bounds memory use).
+
+    Returns:
+        np.ndarray: (N, 8, 8) float64 distances, or (8, 8) for a single frame.
+    """
+    distance = get_metric(metric)
+    histograms = np.asarray(histograms)
+    single = histograms.ndim == 2
+    batch = histograms[np.newaxis] if single else histograms
+
+    num_frames, num_cameras = batch.shape[:2]
+    # All metrics are symmetric with a zero diagonal, so only the upper triangle is computed.
+    rows, cols = np.triu_indices(num_cameras, k=1)
+    result = np.zeros((num_frames, num_cameras, num_cameras), dtype=np.float64)
+    for start in range(0, num_frames, chunk_size):
+        p = normalize_histograms(batch[start:start + chunk_size])
+        pairs = distance(p[:, rows], p[:, cols])
+        result[start:start + chunk_size, rows, cols] = pairs
+        result[start:start + chunk_size, cols, rows] = pairs
+
+    return result[0] if single else result
+
+def reference_distances(histograms, reference, metric="chi2", chunk_size=256):
+    """
+    Computes the distance of every camera histogram to a reference histogram.
+
+    Parameters:
+        histograms (np.ndarray): Counts of shape (N, 8, 1024).
+        reference (np.ndarray): Reference counts broadcastable to histograms,
+            e.g. (8, 1024) per camera or (N, 8, 1024) from temporal_reference().
+        metric (str): One of "chi2", "bhattacharyya", "l1", "emd".
+        chunk_size (int): Frames processed per vectorized step (bounds memory use).
+
+    Returns:
+        np.ndarray: (N, 8) float64 distances.
+    """
+    distance = get_metric(metric)
+    histograms = np.asarray(histograms)
+    reference = np.broadcast_to(np.asarray(reference), histograms.shape)
+
+    result = np.empty(histograms.shape[:-1], dtype=np.float64)
+    for start in range(0, histograms.shape[0], chunk_size):
+        stop = start + chunk_size
+        result[start:stop] = distance(normalize_histograms(histograms[start:stop]),
+                                      normalize_histograms(reference[start:stop]))
+    return result
+
+def temporal_reference(histograms, window=30, start=0, stop=None):
+    """
+    Builds each camera's reference from its own history: the mean of the
+    previous `window` frames (fewer at the start of the batch).
+
+    Frame 0 has no history and uses itself, so its temporal distance is zero.
+
+    Parameters:
+        histograms (np.ndarray): Counts of shape (N, 8, 1024).
+        window (int): Number of previous frames averaged.
+        start (int): First frame to build a reference for.
+        stop (int): End of the frame range (default: N).
+
+    Returns:
+        np.ndarray: (stop - start, 8, 1024) float64 reference histograms.
+    """
+    histograms = np.asarray(histograms)
+    stop = histograms.shape[0] if stop is None else min(stop, histograms.shape[0])
+    first_needed = max(start - window, 0)
+
+    # Only the requested frames and their history window are summed, straight
+    # from the counts into one float64 buffer (row 0 is the empty sum).
+    cumulative = np.zeros((stop - first_needed + 1,) + histograms.shape[1:], dtype=np.float64)
+    np.cumsum(histograms[first_needed:stop], axis=0, dtype=np.float64, out=cumulative[1:])
+
+    frames = np.arange(start, stop) - first_needed
+    first = np.maximum(frames - window, 0)
+    num_previous = (frames - first)[:, np.newaxis, np.newaxis]
+
+    reference = cumulative[first]
+    np.subtract(cumulative[start - first_needed:stop - first_needed], reference, out=reference)
+    np.divide(reference, num_previous, out=reference, where=num_previous > 0)
+    # Frames without history (frame 0, or every frame for window 0) are their own reference.
+    no_history = num_previous[:, 0, 0] == 0
+    if no_history.any():
+        reference[no_history] = histograms[start:stop][no_history]
+    return reference
+
+def temporal_distances(histograms, metric="chi2", window=30, chunk_size=256):
+    """
+    Computes the distance of every camera histogram to temporal_reference(),
+    one chunk of frames at a time, so memory use depends on chunk_size and
+    not on the number of frames.
+
+    Returns:
+        np.ndarray: (N, 8) float64 distances.
+    """
+    distance = get_metric(metric)
+    histograms = np.asarray(histograms)
+
+    result = np.empty(histograms.shape[:-1], dtype=np.float64)
+    for start in range(0, histograms.shape[0], chunk_size):
+        stop = start + chunk_size
+        reference = temporal_reference(histograms, window, start, stop)
+        result[start:stop] = distance(normalize_histograms(histograms[start:stop]),
+                                      normalize_histograms(reference, in_place=True))
+    return result
+
+def detect_anomalies(histograms, metric="chi2", camera_threshold=None, temporal_threshold=None,
+                     reference=None, window=30):
+    """
+    Flags cameras that disagree with the other cameras or with their own history.
+
+    A camera is flagged against the others when its median distance to the other
+    7 cameras exceeds camera_threshold, so a single failing sensor does not flag
+    the healthy ones. It is flagged against its history when its distance to the
+    reference (its temporal_reference() if none is given) exceeds temporal_threshold.
+
+    Parameters:
+        histograms (np.ndarray): Counts of shape (N, 8, 1024).
+        metric (str): One of "chi2", "bhattacharyya", "l1", "emd".
+        camera_threshold (float): Cross-camera threshold, None to skip the flags.
+        temporal_threshold (float): Frame-to-reference threshold, None to skip the flags.
+        reference (np.ndarray): Reference counts broadcastable to histograms.
+        window (int): History length for the default temporal reference.
+
+    Returns:
+        dict: "pairwise" (N, 8, 8), "camera_score" (N, 8) and "reference" (N, 8)
+            distances, plus "camera_flags" and "temporal_flags" (N, 8) bool
+            arrays when the matching threshold is given.
+    """
+    histograms = np.asarray(histograms)
+    if histograms.ndim == 2:
+        histograms = histograms[np.newaxis]
+
+    pairwise = pairwise_camera_distances(histograms, metric)
+    num_cameras = pairwise.shape[-1]
+    # Drop the zero self-distance on the diagonal before taking the median.
+    off_diagonal = ~np.eye(num_cameras, dtype=bool)
+    others = pairwise[:, off_diagonal].reshape(-1, num_cameras, num_cameras - 1)
+    camera_score = np.median(others, axis=-1)
+
+    if reference is None:
+        to_reference = temporal_distances(histograms, metric, window)
+    else:
+        to_reference = reference_distances(histograms, reference, metric)
+
+    result = {
+        "pairwise": pairwise,
+        "camera_score": camera_score,
+        "reference": to_reference,
+    }
+    if camera_threshold is not None:
+        result["camera_flags"] = camera_score > camera_threshold
+    if temporal_threshold is not None:
+        result["temporal_flags"] = to_reference > temporal_threshold
+    return result
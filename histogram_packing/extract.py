@@ -0,0 +1,207 @@
+import os
+import struct
+
+from .constants import (NUM_BINS, NUM_CAMERAS, COUNT_BITS, BIN_SIZE_BYTES, PACKED_SIZE, PYRAMID_LEVELS, PYRAMID_MAGIC, PYRAMID_VERSION,
+                        PYRAMID_HEADER_FORMAT, PYRAMID_HEADER_SIZE, SPARSE_MAGIC, SPARSE_VERSION,
+                        SPARSE_HEADER_FORMAT, SPARSE_HEADER_SIZE, SPARSE_ENTRY_BITS)
+
+def extract_histogram(packed_filename, image_index):
+    """
+    Extracts the histogram for a specific image from the packed file.
+    
+    Parameters:
+        packed_filename (str): Path to the packed file (21504 bytes, or a smaller sparse frame).
+        image_index (int): Which histogram to extract (1 to 8, 1-indexed).
+    
+    Returns:
+        list: A list of 1024 integer counts representing the histogram.
+    """
+    if image_index < 1 or image_index > NUM_CAMERAS:
+        raise ValueError(f"Image index must be between 1 and {NUM_CAMERAS}.")
+    
+    segment_mask = (1 << COUNT_BITS) - 1  # mask to extract 21 bits (0x1FFFFF)
+
+    # Read the entire packed file
+    with open(packed_filename, "rb") as f:
+        data = f.read()
+    
+    if len(data) != PACKED_SIZE:
+        if data[:len(SPARSE_MAGIC)] == SPARSE_MAGIC:
+            return extract_sparse_histogram(data, image_index)
+        raise ValueError(f"Unexpected file size: expected {PACKED_SIZE} bytes, got {len(data)} bytes")
+    
+    histogram = []
+    for bin_idx in range(NUM_BINS):
+        start = bin_idx * BIN_SIZE_BYTES
+        end = start + BIN_SIZE_BYTES
+        bin_bytes = data[start:end]
+        # Convert the 21 bytes (168 bits) into an integer (little-endian)
+        bin_value = int.from_bytes(bin_bytes, byteorder='little')
+        # Each histogram's count is stored in a consecutive 21-bit field.
+        # For image_index (1-indexed), the bits are at offset (image_index-1)*21.
+        shift = (image_index - 1) * COUNT_BITS
+        count = (bin_value >> shift) & segment_mask
+        histogram.append(count)
+    
+    return histogram
+
+def sparse_packed_size(num_entries):
+    """
+    Returns the size in bytes of a sparse packed frame with num_entries occupied bins.
+    """
+    return SPARSE_HEADER_SIZE + (num_entries * SPARSE_ENTRY_BITS + 7) // 8
+
+def check_sparse_header(data):
+    """
+    Validates the header and size of a sparse packed frame.
+
+    Parameters:
+        data (bytes): The sparse packed frame.
+
+    Returns:
+        list: Number of entries (occupied bins) of each camera.
+
+    Raises:
+        ValueError: If the data is not a complete sparse frame smaller than a dense frame.
+    """
+    if len(data) < SPARSE_HEADER_SIZE:
+        raise ValueError(f"Sparse packed frame is too short: {len(data)} bytes")
+    magic, version, *num_entries = struct.unpack(SPARSE_HEADER_FORMAT, bytes(data[:SPARSE_HEADER_SIZE]))
+    if magic != SPARSE_MAGIC or version != SPARSE_VERSION:
+        raise ValueError(f"Not a version {SPARSE_VERSION} sparse packed frame")
+
+    expected_size = sparse_packed_size(sum(num_entries))
+    if expected_size >= PACKED_SIZE or len(data) != expected_size:
+        raise ValueError(f"Unexpected sparse frame size: {len(data)} bytes for {sum(num_entries)} entries")
+    return num_entries
+
+def extract_sparse_histogram(data, image_index):
+    """
+    Extracts one camera's histogram from a sparse packed frame, decoding only that camera's entries.
+
+    Parameters:
+        data (bytes): The sparse packed frame.
+        image_index (int): Which histogram to extract (1 to 8, 1-indexed).
+
+    Returns:
+        list: A list of 1024 integer counts representing the histogram.
+    """
+    num_entries = check_sparse_header(data)
+
+    # Entries are stored camera after camera, so skip the cameras before this one.
+    first = sum(num_entries[:image_index - 1])
+    count = num_entries[image_index - 1]
+    bit_start = first * SPARSE_ENTRY_BITS
+    bit_end = (first + count) * SPARSE_ENTRY_BITS
+    byte_start = SPARSE_HEADER_SIZE + bit_start // 8
+    byte_end = SPARSE_HEADER_SIZE + (bit_end + 7) // 8
+    bits = int.from_bytes(data[byte_start:byte_end], byteorder='little') >> (bit_start % 8)
+
+    entry_mask = (1 << SPARSE_ENTRY_BITS) - 1
+    count_mask = (1 << COUNT_BITS) - 1
+    histogram = [0] * NUM_BINS
+    previous = -1
+    for _ in range(count):
+        entry = bits & entry_mask
+        bits >>= SPARSE_ENTRY_BITS
+        bin_idx = entry >> COUNT_BITS
+        # The encoder writes each camera's bins in increasing order, so a repeat means a corrupt frame.
+        if bin_idx <= previous:
+            raise ValueError(f"Sparse packed frame bins of camera {image_index} are not strictly increasing")
+        previous = bin_idx
+        histogram[bin_idx] = entry & count_mask
+
+    return histogram
+
+def pyramid_level_offset(num_bins):
+    """
+    Returns the byte offset of a level in a pyramid file.
+
+    Levels are stored coarsest first and each level is half the size of the
+    next, so the levels before num_bins hold (num_bins - 16) bins per camera.
+    """
+    if num_bins not in PYRAMID_LEVELS:
+        raise ValueError(f"Pyramid levels are {', '.join(map(str, PYRAMID_LEVELS))} bins, got {num_bins}")
+    return PYRAMID_HEADER_SIZE + NUM_CAMERAS * 4 * (num_bins - PYRAMID_LEVELS[0])
+
+def pyramid_filename(packed_filename):
+    """
+    Returns the sidecar pyramid path stored next to a packed file.
+    """
+    return packed_filename + ".pyr"
+
+def check_pyramid_header(f, filename):
+    """
+    Reads and validates the header of a pyramid file.
+
+    Parameters:
+        f (file): The pyramid file opened in binary mode, at its start.
+        filename (str): Its path, for error messages.
+
+    Raises:
+        ValueError: If it is not a current-version pyramid file with the expected layout.
+    """
+    header = f.read(PYRAMID_HEADER_SIZE)
+    if len(header) != PYRAMID_HEADER_SIZE:
+        raise ValueError(f"{filename} is not a version {PYRAMID_VERSION} pyramid file")
+    magic, version, num_cameras, num_levels = struct.unpack(PYRAMID_HEADER_FORMAT, header)
+    if magic != PYRAMID_MAGIC or version != PYRAMID_VERSION:
+        raise ValueError(f"{filename} is not a version {PYRAMID_VERSION} pyramid file")
+    if num_cameras != NUM_CAMERAS or num_levels != len(PYRAMID_LEVELS):
+        raise ValueError(f"Unexpected pyramid layout in {filename}")
+
+def read_pyramid_level(filename, image_index, num_bins):
+    """
+    Reads one camera's rebinned histogram from a pyramid file, without touching the full-resolution data.
+
+    Parameters:
+        filename (str): Path to the pyramid file (e.g. "histograms.pack.pyr").
+        image_index (int): Which histogram to read (1 to 8, 1-indexed).
+        num_bins (int): Level to read (16, 32, 64, 128, 256 or 512).
+
+    Returns:
+        list: A list of num_bins integer counts.
+    """
+    if image_index < 1 or image_index > NUM_CAMERAS:
+        raise ValueError(f"Image index must be between 1 and {NUM_CAMERAS}.")
+
+    offset = pyramid_level_offset(num_bins) + (image_index - 1) * num_bins * 4
+
+    with open(filename, "rb") as f:
+        check_pyramid_header(f, filename)
+        f.seek(offset)
+        data = f.read(num_bins * 4)
+
+    if len(data) != num_bins * 4:
+        raise ValueError(f"Pyramid file {filename} is truncated")
+    return list(struct.unpack(f"<{num_bins}I", data))
+
+def extract_preview(packed_filename, image_index, num_bins):
+    """
+    Returns one camera's histogram rebinned to num_bins bins.
+
+    The level is read from the packed file's .pyr sidecar when it exists and
+    is not older than the packed file; otherwise the full histogram is
+    extracted and rebinned, which gives the same counts.
+
+    Parameters:
+        packed_filename (str): Path to the packed file.
+        image_index (int): Which histogram to extract (1 to 8, 1-indexed).
+        num_bins (int): 1024, or a pyramid level (16, 32, 64, 128, 256 or 512).
+
+    Returns:
+        list: A list of num_bins integer counts.
+    """
+    if num_bins == NUM_BINS:
+        return extract_histogram(packed_filename, image_index)
+
+    sidecar_filename = pyramid_filename(packed_filename)
+    if (os.path.exists(sidecar_filename)
+            and os.path.getmtime(sidecar_filename) >= os.path.getmtime(packed_filename)):
+        return read_pyramid_level(sidecar_filename, image_index, num_bins)
+
+    if num_bins not in PYRAMID_LEVELS:
+        raise ValueError(f"Pyramid levels are {', '.join(map(str, PYRAMID_LEVELS))} bins, got {num_bins}")
+    histogram = extract_histogram(packed_filename, image_index)
+    factor = len(histogram) // num_bins
+    return [sum(histogram[i:i + factor]) for i in range(0, len(histogram), factor)]
@@ -0,0 +1,258 @@
+import os
+import struct
+import numpy as np
+
+from .constants import (NUM_BINS, NUM_CAMERAS, COUNT_BITS, BIN_SIZE_BYTES, PACKED_SIZE, SPARSE_MAGIC,
+                        SPARSE_VERSION, SPARSE_HEADER_FORMAT, SPARSE_HEADER_SIZE, SPARSE_ENTRY_BITS)
+from .extract import check_sparse_header, sparse_packed_size
+
+COUNT_MASK = (1 << COUNT_BITS) - 1
+
+def check_histogram_counts(histograms):
+    """
+    Validates 8 histograms for packing and returns them as an array.
+
+    Raises:
+        ValueError: If the shape is not (8, 1024) or a count does not fit in 21 bits.
+    """
+    counts = np.asarray(histograms)
+    if counts.shape != (NUM_CAMERAS, NUM_BINS):
+        raise ValueError(f"Expected histograms of shape ({NUM_CAMERAS}, {NUM_BINS}), got {counts.shape}")
+
+    overflow = np.argwhere(counts > COUNT_MASK)
+    if overflow.size:
+        img_idx, bin_idx = overflow[0]
+        raise ValueError(f"Histogram count {int(counts[img_idx, bin_idx])} at bin {bin_idx} in image {img_idx+1} exceeds {COUNT_BITS} bits")
+    return counts
+
+def pack_histogram_bytes(histograms):
+    """
+    Packs 8 histograms into the 21504-byte packed format and returns the bytes.
+
+    The bit layout is identical to pack_histograms(), but all 1024 bins are
+    packed at once with NumPy bit operations instead of a Python loop.
+
+    Parameters:
+        histograms (array-like): 8 histograms of 1024 counts each, shape (8, 1024).
+
+    Returns:
+        bytes: The packed data (1024 bins * 21 bytes).
+    """
+    counts = check_histogram_counts(histograms)
+
+    # Split each (bin, image) count into its little-endian bits and keep the low 21.
+    words = np.ascontiguousarray(counts.T, dtype="<u4")
+    bits = np.unpackbits(words.view(np.uint8).reshape(NUM_BINS, NUM_CAMERAS, 4), axis=-1,
+                         bitorder="little")[:, :, :COUNT_BITS]
+    # Image1's count goes in bits 0-20 of each 168-bit block, image2's in bits 21-41, etc.
+    packed = np.packbits(bits.reshape(NUM_BINS, BIN_SIZE_BYTES * 8), axis=-1, bitorder="little")
+    return packed.tobytes()
+
+def pack_histograms(histograms, output_filename, sparse=False):
+    """
+    Packs 8 histograms into a single binary file.
+    
+    For each of the 1024 bins:
+      - Pack the 8 counts (one per histogram) using 21 bits each.
+      - The 8 counts are concatenated to form a 168-bit (21-byte) integer.
+    
+    The final file will be 21 bytes * 1024 = 21504 bytes. With sparse=True the
+    sparse format is written instead when it is smaller (see pack_histogram_frame()).
+    """
+    if sparse:
+        with open(output_filename, "wb") as f:
+            f.write(pack_histogram_frame(histograms))
+        print(f"Packed file saved to {output_filename}")
+        return
+
+    num_images = len(histograms)
+    
+    packed_data = bytearray()
+    
+    for bin_idx in range(NUM_BINS):
+        packed_value = 0
+        for img_idx in range(num_images):
+            count = int(histograms[img_idx][bin_idx])
+            # Ensure the count fits in 21 bits.
+            if count > COUNT_MASK:
+                raise ValueError(f"Histogram count {count} at bin {bin_idx} in image {img_idx+1} exceeds {COUNT_BITS} bits")
+            # Pack: image1's count goes in bits 0-20, image2's in bits 21-41, etc.
+            packed_value |= (count & COUNT_MASK) << (COUNT_BITS * img_idx)
+        # Convert the 168-bit integer into 21 bytes (little-endian).
+        packed_bytes = packed_value.to_bytes(BIN_SIZE_BYTES, byteorder='little')
+        packed_data.extend(packed_bytes)
+    
+    with open(output_filename, "wb") as f:
+        f.write(packed_data)
+    
+    print(f"Packed file saved to {output_filename}")
+
+def unpack_histogram_array(data):
+    """
+    Decodes one or more packed histogram frames without writing any files.
+
+    Each frame is 21504 bytes (1024 bins × 21 bytes per bin) in the same layout
+    that unpack_histograms() reads. All frames and bins are decoded at once with
+    NumPy bit operations.
+
+    Parameters:
+        data (bytes or np.ndarray): One packed frame, or N frames as a
+            contiguous buffer or an (N, 21504) uint8 array.
+
+    Returns:
+        np.ndarray: (8, 1024) uint32 counts for a single bytes frame,
+            otherwise (N, 8, 1024).
+    """
+    single = isinstance(data, (bytes, bytearray, memoryview))
+    raw = np.frombuffer(data, dtype=np.uint8) if single else np.asarray(data, dtype=np.uint8)
+    if raw.size % PACKED_SIZE != 0:
+        raise ValueError(f"Expected a multiple of {PACKED_SIZE} bytes, got {raw.size} bytes.")
+    single = single and raw.size == PACKED_SIZE
+
+    # Split every 21-byte bin into 168 bits, then regroup as eight 21-bit counts.
+    raw = raw.reshape(-1, NUM_BINS, BIN_SIZE_BYTES)
+    bits = np.unpackbits(raw, axis=-1, bitorder='little').reshape(-1, NUM_BINS, NUM_CAMERAS, COUNT_BITS)
+    padded = np.zeros(bits.shape[:-1] + (32,), dtype=np.uint8)
+    padded[..., :COUNT_BITS] = bits
+    counts = np.packbits(padded, axis=-1, bitorder='little').view('<u4')[..., 0]
+
+    # (frames, bins, images) -> (frames, images, bins)
+    histograms = np.ascontiguousarray(counts.transpose(0, 2, 1), dtype=np.uint32)
+    return histograms[0] if single else histograms
+
+def pack_sparse_histogram_bytes(histograms):
+    """
+    Packs 8 histograms into the sparse format, storing only the occupied bins.
+
+    Readers tell the formats apart by file size, so a sparse frame must be
+    smaller than the dense one; use pack_histogram_frame() to pick the format.
+
+    Parameters:
+        histograms (array-like): 8 histograms of 1024 counts each, shape (8, 1024).
+
+    Returns:
+        bytes: Header with the occupied-bin count of each camera, followed by a
+            bit stream of 31-bit entries (bin index << 21 | count).
+
+    Raises:
+        ValueError: If the sparse frame would not be smaller than PACKED_SIZE bytes.
+    """
+    counts = check_histogram_counts(histograms)
+
+    # np.nonzero walks row-major, so entries are grouped by camera and sorted by bin.
+    cameras, bins = np.nonzero(counts)
+    if sparse_packed_size(len(bins)) >= PACKED_SIZE:
+        raise ValueError(f"{len(bins)} occupied bins do not fit a sparse frame smaller than {PACKED_SIZE} bytes")
+    num_entries = np.bincount(cameras, minlength=NUM_CAMERAS)
+    entries = (bins.astype("<u4") << COUNT_BITS) | counts[cameras, bins].astype("<u4")
+
+    bits = np.unpackbits(entries.view(np.uint8).reshape(-1, 4), axis=-1, bitorder="little")[:, :SPARSE_ENTRY_BITS]
+    body = np.packbits(bits.ravel(), bitorder="little").tobytes()
+    header = struct.pack(SPARSE_HEADER_FORMAT, SPARSE_MAGIC, SPARSE_VERSION, *num_entries.tolist())
+    return header + body
+
+def pack_histogram_frame(histograms):
+    """
+    Packs 8 histograms into whichever of the dense and sparse formats is smaller.
+
+    Frames with few occupied bins (e.g. bars or a constant image) use the
+    sparse format; everything else is the standard 21504-byte packed frame.
+
+    Returns:
+        bytes: The packed frame.
+    """
+    counts = check_histogram_counts(histograms)
+    if sparse_packed_size(np.count_nonzero(counts)) < PACKED_SIZE:
+        return pack_sparse_histogram_bytes(counts)
+    return pack_histogram_bytes(counts)
+
+def unpack_sparse_histogram_bytes(data):
+    """
+    Decodes a sparse packed frame.
+
+    Parameters:
+        data (bytes): The sparse packed frame.
+
+    Returns:
+        np.ndarray: (8, 1024) uint32 counts.
+    """
+    num_entries = check_sparse_header(data)
+    total = sum(num_entries)
+
+    body = np.frombuffer(data, dtype=np.uint8, offset=SPARSE_HEADER_SIZE)
+    bits = np.unpackbits(body, bitorder="little")[:total * SPARSE_ENTRY_BITS].reshape(total, SPARSE_ENTRY_BITS)
+    padded = np.zeros((total, 32), dtype=np.uint8)
+    padded[:, :SPARSE_ENTRY_BITS] = bits
+    entries = np.packbits(padded, axis=-1, bitorder="little").view("<u4")[:, 0]
+
+    bins = entries >> COUNT_BITS
+    cameras = np.repeat(np.arange(NUM_CAMERAS), num_entries)
+    # The encoder writes each camera's bins in increasing order, so a repeat means a corrupt frame.
+    same_camera = cameras[1:] == cameras[:-1]
+    if np.any(bins[1:][same_camera] <= bins[:-1][same_camera]):
+        raise ValueError("Sparse packed frame bins are not strictly increasing within a camera.")
+
+    histograms = np.zeros((NUM_CAMERAS, NUM_BINS), dtype=np.uint32)
+    histograms[cameras, bins] = entries & COUNT_MASK
+    return histograms
+
+def decode_packed_frame(data):
+    """
+    Decodes one packed frame in either the dense or the sparse format.
+
+    Parameters:
+        data (bytes): The packed frame.
+
+    Returns:
+        np.ndarray: (8, 1024) uint32 counts.
+    """
+    if len(data) == PACKED_SIZE:
+        return unpack_histogram_array(bytes(data))
+    if bytes(data[:len(SPARSE_MAGIC)]) == SPARSE_MAGIC:
+        return unpack_sparse_histogram_bytes(bytes(data))
+    raise ValueError(f"Expected file size {PACKED_SIZE} bytes or a sparse packed frame, got {len(data)} bytes.")
+
+def unpack_histograms(packed_filename, output_folder):
+    """
+    Unpacks a packed histogram file into 8 separate histogram files.
+    
+    The packed file is expected to be 21504 bytes long (1024 bins × 21 bytes per bin)
+    where each 21-byte block contains eight 21-bit counts (one per histogram) stored
+    consecutively (little-endian). This function extracts each 21-bit count and saves
+    each histogram as a binary file with 1024 32-bit unsigned integers. Smaller files
+    are decoded as sparse packed frames.
+    
+    Parameters:
+        packed_filename (str): Path to the packed file (e.g., "histograms.pack").
+        output_folder (str): Folder where the unpacked histogram files will be saved.
+    """
+    # Read the entire packed file.
+    with open(packed_filename, "rb") as f:
+        data = f.read()
+    
+    if len(data) != PACKED_SIZE:
+        # Sparse frames are always smaller than the dense format.
+        histograms = list(decode_packed_frame(data))
+    else:
+        # Prepare 8 numpy arrays (one for each histogram) with 1024 bins each.
+        histograms = [np.zeros(NUM_BINS, dtype=np.uint32) for _ in range(NUM_CAMERAS)]
+
+        # Process each bin.
+        for bin_idx in range(NUM_BINS):
+            offset = bin_idx * BIN_SIZE_BYTES
+            # Extract 21 bytes for the current bin.
+            bin_bytes = data[offset:offset + BIN_SIZE_BYTES]
+            # Convert these 21 bytes (168 bits) into an integer (little-endian).
+            bin_value = int.from_bytes(bin_bytes, byteorder='little')
+        
+            # For each histogram (0 to 7), extract the corresponding 21-bit segment.
+            for img_idx in range(NUM_CAMERAS):
+                shift = img_idx * COUNT_BITS
+                count = (bin_value >> shift) & COUNT_MASK
+                histograms[img_idx][bin_idx] = count
+
+    # Write each histogram out as a 32-bit binary file.
+    for img_idx in range(NUM_CAMERAS):
+        output_filename = os.path.join(output_folder, f"pattern_unpacked_{img_idx+1}.bin")
+        histograms[img_idx].tofile(output_filename)
+        print(f"Saved unpacked histogram to {output_filename}")
@@ -0,0 +1,70 @@
+import numpy as np
+
+def generate_test_pattern(pattern_index, height=1080, width=1920):
+    """
+    Generate one of eight 10-bit test pattern images.
+    The pixel values are in the range 0 to 1023 (10-bit).
+    
+    Pattern choices:
+      1. Horizontal gradient
+      2. Vertical gradient
+      3. Diagonal gradient
+      4. Monochrome Bars
+      5. Radial gradient from center
+      6. Horizontal sine wave
+      7. Random noise
+      8. Constant mid-level (512)
+      
+    Returns:
+        image (np.ndarray): A (height x width) uint16 array with values 0–1023.
+    """
+    if pattern_index == 1:
+        # Horizontal gradient: left=0, right=1023
+        row = np.linspace(0, 1023, width, dtype=np.uint16)
+        image = np.tile(row, (height, 1))
+    elif pattern_index == 2:
+        # Vertical gradient: top=0, bottom=1023
+        col = np.linspace(0, 1023, height, dtype=np.uint16)
+        image = np.repeat(col[:, np.newaxis], width, axis=1)
+    elif pattern_index == 3:
+        # Diagonal gradient: combination of horizontal and vertical
+        x = np.linspace(0, width-1, width, dtype=np.float32)
+        y = np.linspace(0, height-1, height, dtype=np.float32)
+        xv, yv = np.meshgrid(x, y)
+        image = ((xv + yv) / ((width-1) + (height-1)) * 1023).astype(np.uint16)
+    elif pattern_index == 4:
+        # Generate 10 monochrome bars across the width of the image
+        num_bars = 10
+        bar_width = width // num_bars
+        bar_values = np.linspace(0, 1023, num_bars, dtype=np.uint16)
+
+        image = np.zeros((height, width), dtype=np.uint16)
+        for i in range(num_bars):
+            image[:, i * bar_width:(i + 1) * bar_width] = bar_values[i]
+
+        # Ensure the last bar covers any remaining pixels due to rounding
+        image[:, num_bars * bar_width:] = bar_values[-1]
+    elif pattern_index == 5:
+        # Radial gradient: distance from center normalized to 0-1023.
+        y = np.linspace(0, height-1, height)
+        x = np.linspace(0, width-1, width)
+        xv, yv = np.meshgrid(x, y)
+        cx, cy = (width-1)/2, (height-1)/2
+        dist = np.sqrt((xv - cx)**2 + (yv - cy)**2)
+        max_dist = np.sqrt(cx**2 + cy**2)
+        image = (dist / max_dist * 1023).astype(np.uint16)
+    elif pattern_index == 6:
+        # Horizontal sine wave.
+        x = np.linspace(0, 2*np.pi, width, dtype=np.float32)
+        sine_row = ((np.sin(x) + 1) / 2 * 1023).astype(np.uint16)
+        image = np.tile(sine_row, (height, 1))
+    elif pattern_index == 7:
+        # Random noise.
+        image = np.random.randint(0, 1024, size=(height, width), dtype=np.uint16)
+    elif pattern_index == 8:
+        # Constant mid-level.
+        image = np.full((height, width), 512, dtype=np.uint16)
+    else:
+        raise ValueError("Invalid pattern index")
+    
+    return image
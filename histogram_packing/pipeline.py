@@ -0,0 +1,238 @@
+import os
+import queue
+import numpy as np
+from multiprocessing import Process, Queue, shared_memory
+
+from .constants import NUM_BINS, NUM_CAMERAS
+from .packing import pack_histogram_bytes, pack_histogram_frame
+from .patterns import generate_test_pattern
+from .pyramid import pyramid_filename, write_pyramid
+
+def create_ring(num_slots, height, width):
+    """
+    Allocates a shared-memory ring buffer holding num_slots frames plus one histogram per slot.
+
+    Parameters:
+        num_slots (int): Number of frame slots in the ring.
+        height (int): Frame height.
+        width (int): Frame width.
+
+    Returns:
+        shared_memory.SharedMemory: The shared block; pass its name to attach_ring() in other processes.
+    """
+    frame_bytes = num_slots * height * width * 2
+    hist_bytes = num_slots * NUM_BINS * 4
+    return shared_memory.SharedMemory(create=True, size=frame_bytes + hist_bytes)
+
+def attach_ring(shm, num_slots, height, width):
+    """
+    Maps NumPy views onto a ring buffer created by create_ring().
+
+    Parameters:
+        shm (shared_memory.SharedMemory): The shared block.
+        num_slots (int): Number of frame slots in the ring.
+        height (int): Frame height.
+        width (int): Frame width.
+
+    Returns:
+        frames (np.ndarray): (num_slots, height, width) uint16 view of the frame slots.
+        histograms (np.ndarray): (num_slots, 1024) uint32 view of the histogram slots.
+    """
+    frame_bytes = num_slots * height * width * 2
+    frames = np.ndarray((num_slots, height, width), dtype=np.uint16, buffer=shm.buf)
+    histograms = np.ndarray((num_slots, NUM_BINS), dtype=np.uint32, buffer=shm.buf, offset=frame_bytes)
+    return frames, histograms
+
+def read_raw_into(filepath, slot):
+    """
+    Reads a 16-bit raw image file directly into a frame slot without an intermediate copy.
+
+    Parameters:
+        filepath (str): Path to the raw file.
+        slot (np.ndarray): Contiguous (height x width) uint16 view to fill.
+    """
+    with open(filepath, "rb") as f:
+        num_read = f.readinto(slot.data.cast("B"))
+        extra = f.read(1)
+
+    if num_read != slot.nbytes or extra:
+        raise ValueError(f"File {filepath} does not contain the expected number of bytes: expected {slot.nbytes}")
+
+def produce_frames(shm_name, num_slots, height, width, source, raw_files, num_frames,
+                   free_slots, work_queue, num_workers):
+    """
+    Producer stage: fills free ring slots with camera frames and hands them to the workers.
+
+    Frame `seq` belongs to packed frame seq // 8 and camera seq % 8. Only the
+    (seq, slot) pair travels through the queue; the pixels stay in shared memory.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames, histograms = attach_ring(shm, num_slots, height, width)
+
+    try:
+        for seq in range(num_frames * NUM_CAMERAS):
+            camera = seq % NUM_CAMERAS
+            slot = free_slots.get()
+            if source == "patterns":
+                frames[slot] = generate_test_pattern(camera + 1, height=height, width=width)
+            else:
+                read_raw_into(raw_files[seq % len(raw_files)], frames[slot])
+            work_queue.put((seq, slot))
+    finally:
+        for _ in range(num_workers):
+            work_queue.put(None)
+        del frames, histograms
+        shm.close()
+
+def histogram_worker(shm_name, num_slots, height, width, work_queue, done_queue):
+    """
+    Worker stage: computes the 1024-bin histogram of a frame slot in place.
+
+    The histogram is written to the slot's histogram area and (seq, slot) is
+    passed on to the packer, which releases the slot once it has the counts.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    frames, histograms = attach_ring(shm, num_slots, height, width)
+
+    try:
+        while True:
+            item = work_queue.get()
+            if item is None:
+                break
+            seq, slot = item
+            # Same counts as np.histogram over 0..1023, values outside 10 bits are dropped.
+            counts = np.bincount(frames[slot].ravel(), minlength=NUM_BINS)
+            histograms[slot] = counts[:NUM_BINS]
+            done_queue.put((seq, slot))
+    finally:
+        done_queue.put(None)
+        del frames, histograms
+        shm.close()
+
+def pack_frames(histograms, done_queue, free_slots, workers, producer, output_folder, pyramid=False, sparse=False):
+    """
+    Packer stage: collects the 8 camera histograms of each frame and writes a packed file per frame.
+
+    Parameters:
+        histograms (np.ndarray): (num_slots, 1024) histogram view of the ring.
+        done_queue (Queue): (seq, slot) pairs from the workers, None once a worker exits.
+        free_slots (Queue): Slot indices handed back to the producer.
+        workers (list): Worker processes, used to detect a crashed worker.
+        producer (Process): Frame producer, used to detect a crashed producer.
+        output_folder (str): Folder for the histograms_NNNNNN.pack files.
+        pyramid (bool): Also write each frame's .pack.pyr rebinned preview levels.
+        sparse (bool): Write frames with few occupied bins in the smaller sparse format.
+
+    Returns:
+        int: Number of packed frames written.
+    """
+    encode = pack_histogram_frame if sparse else pack_histogram_bytes
+    pending = {}
+    num_packed = 0
+    finished_workers = 0
+
+    while finished_workers < len(workers):
+        try:
+            item = done_queue.get(timeout=1.0)
+        except queue.Empty:
+            if producer.exitcode not in (None, 0):
+                raise RuntimeError("Frame producer exited unexpectedly")
+            if any(w.exitcode not in (None, 0) for w in workers):
+                raise RuntimeError("A histogram worker exited unexpectedly")
+            continue
+
+        if item is None:
+            finished_workers += 1
+            continue
+
+        seq, slot = item
+        frame_idx, camera = divmod(seq, NUM_CAMERAS)
+        group = pending.setdefault(frame_idx, [np.zeros((NUM_CAMERAS, NUM_BINS), dtype=np.uint32), 0])
+        group[0][camera] = histograms[slot]
+        group[1] += 1
+        free_slots.put(slot)
+
+        if group[1] == NUM_CAMERAS:
+            del pending[frame_idx]
+            output_filename = os.path.join(output_folder, f"histograms_{frame_idx:06d}.pack")
+            with open(output_filename, "wb") as f:
+                f.write(encode(group[0]))
+            if pyramid:
+                write_pyramid(group[0], pyramid_filename(output_filename))
+            num_packed += 1
+
+    # A producer that fails (e.g. on a bad raw file) still stops the workers,
+    # so report it before the incomplete frames it leaves behind.
+    producer.join()
+    if producer.exitcode != 0:
+        raise RuntimeError("Frame producer exited unexpectedly")
+    if pending:
+        raise RuntimeError(f"{len(pending)} packed frames are incomplete")
+
+    return num_packed
+
+def run_pipeline(source, output_folder, num_frames=None, raw_files=None, num_workers=None,
+                 num_slots=None, width=1920, height=1080, pyramid=False, sparse=False):
+    """
+    Runs the producer -> histogram workers -> packer pipeline over a shared-memory ring buffer.
+
+    Parameters:
+        source (str): "raw" to read raw_files, "patterns" to generate the 8 test patterns.
+        output_folder (str): Folder where the packed frames are written.
+        num_frames (int): Number of packed (8-camera) frames to produce.
+        raw_files (list): Raw image files, 8 per packed frame, cameras in order.
+        num_workers (int): Number of histogram worker processes (default: CPU count).
+        num_slots (int): Number of ring slots (default: 2 per worker, at least 8).
+        width (int): Frame width.
+        height (int): Frame height.
+        pyramid (bool): Also write each frame's .pack.pyr rebinned preview levels.
+        sparse (bool): Write frames with few occupied bins in the smaller sparse format.
+
+    Returns:
+        int: Number of packed frames written.
+    """
+    if source == "raw":
+        if not raw_files or len(raw_files) % NUM_CAMERAS != 0:
+            raise ValueError(f"Expected a multiple of {NUM_CAMERAS} raw files, got {len(raw_files or [])}")
+        if num_frames is None:
+            num_frames = len(raw_files) // NUM_CAMERAS
+    elif source != "patterns":
+        raise ValueError(f"Unknown frame source: {source}")
+    if num_frames is None:
+        num_frames = 1
+
+    num_workers = num_workers or os.cpu_count() or 1
+    num_slots = num_slots or max(2 * num_workers, NUM_CAMERAS)
+    os.makedirs(output_folder, exist_ok=True)
+
+    shm = create_ring(num_slots, height, width)
+    frames, histograms = attach_ring(shm, num_slots, height, width)
+    free_slots = Queue()
+    work_queue = Queue()
+    done_queue = Queue()
+    for slot in range(num_slots):
+        free_slots.put(slot)
+
+    ring_args = (shm.name, num_slots, height, width)
+    producer = Process(target=produce_frames,
+                       args=ring_args + (source, raw_files, num_frames, free_slots, work_queue, num_workers))
+    workers = [Process(target=histogram_worker, args=ring_args + (work_queue, done_queue))
+               for _ in range(num_workers)]
+
+    try:
+        producer.start()
+        for w in workers:
+            w.start()
+        num_packed = pack_frames(histograms, done_queue, free_slots, workers, producer, output_folder,
+                                 pyramid, sparse)
+        for w in workers:
+            w.join()
+    finally:
+        for p in [producer] + workers:
+            if p.is_alive():
+                p.terminate()
+        del frames, histograms
+        shm.close()
+        shm.unlink()
+
+    return num_packed
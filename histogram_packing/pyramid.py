@@ -0,0 +1,106 @@
+import struct
+import numpy as np
+
+from .constants import (NUM_BINS, NUM_CAMERAS, PYRAMID_LEVELS, PYRAMID_MAGIC, PYRAMID_VERSION,
+                        PYRAMID_HEADER_FORMAT)
+from .extract import check_pyramid_header, pyramid_filename, pyramid_level_offset
+from .packing import decode_packed_frame
+
+def rebin_histograms(histograms, num_bins):
+    """
+    Sums groups of adjacent bins so each histogram has num_bins bins.
+
+    Parameters:
+        histograms (np.ndarray): Counts of shape (..., bins), bins a multiple of num_bins.
+        num_bins (int): Number of output bins.
+
+    Returns:
+        np.ndarray: uint32 counts of shape (..., num_bins); the total of every histogram is unchanged.
+    """
+    counts = np.asarray(histograms)
+    if num_bins <= 0 or counts.shape[-1] % num_bins != 0:
+        raise ValueError(f"Cannot rebin {counts.shape[-1]} bins into {num_bins} bins")
+
+    factor = counts.shape[-1] // num_bins
+    return counts.reshape(counts.shape[:-1] + (num_bins, factor)).sum(axis=-1, dtype=np.uint32)
+
+def build_pyramid(histograms):
+    """
+    Builds every pyramid level (512 down to 16 bins) from full-resolution histograms.
+
+    Each level is summed from the one above it, so all levels add up to
+    exactly the same totals as the full histogram.
+
+    Parameters:
+        histograms (np.ndarray): Counts of shape (..., 1024).
+
+    Returns:
+        dict: num_bins -> uint32 counts of shape (..., num_bins).
+    """
+    levels = {}
+    current = np.asarray(histograms, dtype=np.uint32)
+    for num_bins in sorted(PYRAMID_LEVELS, reverse=True):
+        current = rebin_histograms(current, num_bins)
+        levels[num_bins] = current
+    return levels
+
+def pyramid_bytes(histograms):
+    """
+    Serializes the pyramid of one packed frame: a 16-byte header followed by
+    the levels coarsest first, each 8 x num_bins little-endian uint32 counts.
+
+    Parameters:
+        histograms (np.ndarray): Counts of shape (8, 1024).
+
+    Returns:
+        bytes: The pyramid file contents.
+    """
+    histograms = np.asarray(histograms)
+    if histograms.shape != (NUM_CAMERAS, NUM_BINS):
+        raise ValueError(f"Expected histograms of shape ({NUM_CAMERAS}, {NUM_BINS}), got {histograms.shape}")
+
+    levels = build_pyramid(histograms)
+    header = struct.pack(PYRAMID_HEADER_FORMAT, PYRAMID_MAGIC, PYRAMID_VERSION, NUM_CAMERAS, len(PYRAMID_LEVELS))
+    body = b"".join(levels[num_bins].astype("<u4").tobytes() for num_bins in PYRAMID_LEVELS)
+    return header + body
+
+def write_pyramid(histograms, output_filename):
+    """
+    Writes the pyramid of one packed frame (see pyramid_bytes()).
+    """
+    with open(output_filename, "wb") as f:
+        f.write(pyramid_bytes(histograms))
+
+def build_pack_pyramid(packed_filename):
+    """
+    Decodes a packed file (dense or sparse) and writes its pyramid sidecar next to it.
+
+    Returns:
+        str: Path of the pyramid file.
+    """
+    with open(packed_filename, "rb") as f:
+        histograms = decode_packed_frame(f.read())
+
+    output_filename = pyramid_filename(packed_filename)
+    write_pyramid(histograms, output_filename)
+    return output_filename
+
+def read_pyramid_levels(filename, num_bins):
+    """
+    Reads one level of all 8 cameras from a pyramid file.
+
+    Parameters:
+        filename (str): Path to the pyramid file.
+        num_bins (int): Level to read (16, 32, 64, 128, 256 or 512).
+
+    Returns:
+        np.ndarray: (8, num_bins) uint32 counts.
+    """
+    with open(filename, "rb") as f:
+        check_pyramid_header(f, filename)
+        f.seek(pyramid_level_offset(num_bins))
+        data = f.read(NUM_CAMERAS * num_bins * 4)
+
+    if len(data) != NUM_CAMERAS * num_bins * 4:
+        raise ValueError(f"Pyramid file {filename} is truncated")
+    return np.frombuffer(data, dtype="<u4").reshape(NUM_CAMERAS, num_bins).astype(np.uint32)
@@ -0,0 +1,58 @@
+import os
+import time
+import argparse
+
+from histogram_packing.constants import NUM_CAMERAS
+from histogram_packing.pipeline import run_pipeline
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compute and pack camera histograms with a multi-process shared-memory pipeline."
+    )
+    parser.add_argument(
+        "--source",
+        choices=["raw", "patterns"],
+        default="raw",
+        help="Read .raw files from the input folder or generate test patterns (default: raw)"
+    )
+    parser.add_argument(
+        "--input-folder",
+        type=str,
+        default=os.path.join(os.getcwd(), "image_patterns"),
+        help="Folder containing the .raw files, 8 per packed frame (default: image_patterns)"
+    )
+    parser.add_argument(
+        "--output-folder",
+        type=str,
+        default=os.path.join(os.getcwd(), "image_patterns", "pipeline"),
+        help="Folder for the packed frames (default: image_patterns/pipeline)"
+    )
+    parser.add_argument("--frames", type=int, default=None, help="Number of packed frames to produce")
+    parser.add_argument("--workers", type=int, default=None, help="Number of histogram worker processes")
+    parser.add_argument("--slots", type=int, default=None, help="Number of shared-memory ring slots")
+    parser.add_argument("--width", type=int, default=1920, help="Frame width (default: 1920)")
+    parser.add_argument("--height", type=int, default=1080, help="Frame height (default: 1080)")
+    parser.add_argument("--pyramid", action="store_true", help="Also write .pack.pyr rebinned preview levels")
+    parser.add_argument("--sparse", action="store_true", help="Use the sparse format for frames where it is smaller")
+    args = parser.parse_args()
+
+    raw_files = None
+    if args.source == "raw":
+        if not os.path.exists(args.input_folder):
+            print(f"Error: Folder '{args.input_folder}' does not exist.")
+            return
+        raw_files = sorted(os.path.join(args.input_folder, f)
+                           for f in os.listdir(args.input_folder) if f.lower().endswith(".raw"))
+
+    start = time.perf_counter()
+    num_packed = run_pipeline(args.source, args.output_folder, num_frames=args.frames, raw_files=raw_files,
+                              num_workers=args.workers, num_slots=args.slots,
+                              width=args.width, height=args.height, pyramid=args.pyramid,
+                              sparse=args.sparse)
+    elapsed = time.perf_counter() - start
+
+    print(f"Packed {num_packed} frames ({num_packed * NUM_CAMERAS} camera images) into {args.output_folder}")
+    print(f"Elapsed {elapsed:.2f} s, {num_packed / elapsed:.2f} packed frames/s")
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,20 @@
 import os
-import numpy as np
+import argparse
 
-def read_fpga_histogram(filename):
-    """
-    Reads an FPGA histogram from a binary file.
-    The file is expected to contain 1024 32-bit unsigned integers.
-    """
-    hist = np.fromfile(filename, dtype=np.uint32)
-    if hist.size != 1024:
-        raise ValueError(f"Unexpected histogram size in {filename}. Expected 1024, got {hist.size}")
-    return hist
-
-def pack_histograms(histograms, output_filename):
-    """
-    Packs 8 histograms into a single binary file.
-    
-    For each of the 1024 bins:
-      - Pack the 8 counts (one per histogram) using 21 bits each.
-      - The 8 counts are concatenated to form a 168-bit (21-byte) integer.
-    
-    The final file will be 21 bytes * 1024 = 21504 bytes.
-    """
-    num_bins = 1024
-    num_images = len(histograms)
-    
-    packed_data = bytearray()
-    
-    for bin_idx in range(num_bins):
-        packed_value = 0
-        for img_idx in range(num_images):
-            count = int(histograms[img_idx][bin_idx])
-            # Ensure the count fits in 21 bits.
-            if count >= (1 << 21):
-                raise ValueError(f"Histogram count {count} at bin {bin_idx} in image {img_idx+1} exceeds 21 bits")
-            # Pack: image1's count goes in bits 0-20, image2's in bits 21-41, etc.
-            packed_value |= (count & ((1 << 21) - 1)) << (21 * img_idx)
-        # Convert the 168-bit integer into 21 bytes (little-endian).
-        packed_bytes = packed_value.to_bytes(21, byteorder='little')
-        packed_data.extend(packed_bytes)
-    
-    with open(output_filename, "wb") as f:
-        f.write(packed_data)
-    
-    print(f"Packed file saved to {output_filename}")
+from histogram_packing.core import read_fpga_histogram
+from histogram_packing.packing import pack_histograms
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Pack image_patterns/pattern_1.bin to pattern_8.bin into image_patterns/histograms.pack."
+    )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Write the sparse format when it is smaller than the 21504-byte dense format"
+    )
+    args = parser.parse_args()
+
     input_folder = os.path.join(os.getcwd(), "image_patterns")
     
     if not os.path.exists(input_folder):
@@ -67,7 +37,7 @@ def main():
         histograms.append(hist)
     
     output_filename = os.path.join(input_folder, "histograms.pack")
-    pack_histograms(histograms, output_filename)
+    pack_histograms(histograms, output_filename, sparse=args.sparse)
 
 if __name__ == "__main__":
     main()